@@ -1,18 +1,134 @@
 import os
 import sys
+import argparse
 import subprocess
 import re
-from typing import List, Optional, Dict, Any
+import json
+import struct
+import functools
+import importlib
+import threading
+import multiprocessing
+import queue
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from types import ModuleType
+from typing import List, Optional, Dict, Any, Iterator, Tuple, Union, TYPE_CHECKING
 
-# Try importing the required packages
-try:
-    from youtube_transcript_api import YouTubeTranscriptApi, TranscriptList
-    import whisper
-except ImportError:
-    print("Required packages not found. Installing packages...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "youtube-transcript-api", "openai-whisper", "yt-dlp"], check=True)
-    from youtube_transcript_api import YouTubeTranscriptApi, TranscriptList
-    import whisper
+if TYPE_CHECKING:
+    import numpy as np
+    from faster_whisper import WhisperModel
+
+def _require(module_name: str, package: str) -> ModuleType:
+    """
+    Import a required module, installing its package first if it's missing.
+    Heavy packages are only imported by the code paths that use them, so the CLI starts quickly.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        print(f"Required package '{package}' not found. Installing...")
+        subprocess.run([sys.executable, "-m", "pip", "install", package], check=True)
+        importlib.invalidate_caches()
+        return importlib.import_module(module_name)
+
+@functools.lru_cache(maxsize=None)
+def _import_optional(module_name: str) -> Optional[ModuleType]:
+    """
+    Import an optional module, or return None if it isn't installed.
+    Used for yt_dlp (falls back to the yt-dlp command) and orjson (falls back to json).
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+def _srt_timestamp(seconds: float) -> str:
+    """Format seconds as an SRT timestamp (HH:MM:SS,mmm)."""
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
+
+# BatchedInferencePipeline and the large-v3-turbo/turbo models need faster-whisper 1.1
+FASTER_WHISPER_REQUIREMENT = "faster-whisper>=1.1.0"
+
+# A bare video ID, and the video ID inside the various YouTube URL forms
+VIDEO_ID_RE = re.compile(r'^([A-Za-z0-9_-]{11})$')
+VIDEO_URL_RE = re.compile(r'(?:v=|\/videos\/|embed\/|youtu\.be\/|\/v\/|\/e\/|watch\?v=|&v=)([^#\&\?\/]{11})')
+
+# Whisper consumes 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Silero VAD settings: silences longer than this are cut before Whisper sees the audio
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+def _select_device(device_index: int = 0) -> Tuple[str, str]:
+    """
+    Pick the device and CTranslate2 compute type to run Whisper with, checking the compute
+    types supported by GPU device_index. Returns a (device, compute_type) tuple.
+    """
+    ctranslate2 = _require("ctranslate2", FASTER_WHISPER_REQUIREMENT)
+    device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    supported = ctranslate2.get_supported_compute_types(device, device_index if device == "cuda" else 0)
+    # Prefer int8 weights with 16-bit activations: FP16 needs Tensor Cores (compute capability >= 7.0),
+    # BF16 needs an Ampere GPU or a CPU build with BF16 kernels; everything else falls back to plain int8
+    for compute_type in ("int8_float16", "int8_bfloat16", "float16", "bfloat16", "int8"):
+        if compute_type in supported:
+            return device, compute_type
+    return device, "float32"
+
+def _read_wav(audio_file: str) -> Optional["np.ndarray"]:
+    """
+    Read a 16 kHz mono 16-bit PCM wav as float32 samples, memory-mapping the PCM data
+    instead of decoding it. Returns None for files in any other format.
+    """
+    with open(audio_file, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"data":
+                offset = f.tell()
+                break
+            # Chunks are padded to an even number of bytes
+            data = f.read(size + size % 2)
+            if chunk_id == b"fmt ":
+                fmt = data
+        data_size = min(size, os.fstat(f.fileno()).st_size - offset)
+    
+    if fmt is None or len(fmt) < 16:
+        return None
+    audio_format, channels, sample_rate = struct.unpack("<HHI", fmt[:8])
+    bits_per_sample = struct.unpack("<H", fmt[14:16])[0]
+    if (audio_format, channels, sample_rate, bits_per_sample) != (1, 1, SAMPLE_RATE, 16):
+        return None
+    
+    np = _require("numpy", "numpy")
+    pcm = np.memmap(audio_file, dtype="<i2", mode="r", offset=offset, shape=(data_size // 2,))
+    samples = pcm.astype(np.float32)
+    samples /= 32768.0
+    return samples
+
+_model_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=4)
+def _load_model(model_name: str, device: str, compute_type: str, device_index: int = 0) -> "WhisperModel":
+    WhisperModel = _require("faster_whisper", FASTER_WHISPER_REQUIREMENT).WhisperModel
+    return WhisperModel(model_name, device=device, device_index=device_index, compute_type=compute_type)
+
+def _get_model(model_name: str, device: str, compute_type: str, device_index: int = 0) -> "WhisperModel":
+    """
+    Return a loaded Whisper model, reusing it across calls.
+    The lock keeps concurrent callers from loading the same model twice.
+    """
+    with _model_lock:
+        return _load_model(model_name, device, compute_type, device_index)
 
 class YouTubeTranscriptTool:
     """
@@ -28,41 +144,75 @@ class YouTubeTranscriptTool:
         "large", "large-v1", "large-v2", "large-v3", "large-v3-turbo", "turbo"
     ]
     
-    @staticmethod
-    def get_downloaded_models() -> List[str]:
+    # Formats the timestamped segments file can be written in
+    SEGMENTS_FORMATS = ["txt", "jsonl", "srt"]
+    
+    # large-v3 accuracy with a 4-layer decoder, several times faster to decode than large-v3
+    DEFAULT_MODEL = "large-v3-turbo"
+    
+    @classmethod
+    def get_downloaded_models(cls) -> List[str]:
         """
         Check which Whisper models have already been downloaded.
         Returns a list of model names that are already downloaded.
         """
-        # Whisper models are stored in ~/.cache/whisper/
-        cache_dir = os.path.expanduser("~/.cache/whisper")
-        if not os.path.exists(cache_dir):
-            return []
+        return list(cls._scan_model_cache())
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _scan_model_cache(cls) -> Tuple[str, ...]:
+        """List the model cache once; cleared whenever a new model gets downloaded."""
+        # faster-whisper models are stored in the Hugging Face hub cache
+        faster_whisper_repos = _require("faster_whisper.utils", FASTER_WHISPER_REQUIREMENT)._MODELS
+        cache_dir = os.environ.get("HF_HUB_CACHE") or os.path.join(
+            os.environ.get("HF_HOME", os.path.expanduser("~/.cache/huggingface")), "hub")
+        try:
+            with os.scandir(cache_dir) as entries:
+                cached = {entry.name for entry in entries}
+        except FileNotFoundError:
+            return ()
             
-        downloaded_models = []
-        for model_name in YouTubeTranscriptTool.WHISPER_MODELS:
-            # Models are stored as [model_name].pt
-            model_path = os.path.join(cache_dir, f"{model_name}.pt")
-            if os.path.exists(model_path):
-                downloaded_models.append(model_name)
-                
-        return downloaded_models
+        # Models are stored as models--[org]--[repo]; names this faster-whisper doesn't know are skipped
+        repos = {model_name: faster_whisper_repos.get(model_name) for model_name in cls.WHISPER_MODELS}
+        return tuple(
+            model_name for model_name, repo_id in repos.items()
+            if repo_id and "models--" + repo_id.replace("/", "--") in cached
+        )
     
-    def __init__(self, output_directory: str = "transcripts"):
-        """Initialize the tool with an output directory."""
+    def __init__(self, output_directory: str = "transcripts", model_name: Optional[str] = None, segments_format: str = "txt",
+                 keep_audio: bool = False):
+        """
+        Initialize the tool with an output directory.
+        If model_name is given, the Whisper model is loaded up front so the first transcription doesn't pay for it.
+        segments_format selects how Whisper's timestamped segments are saved: "txt", "jsonl" or "srt".
+        Downloaded audio is deleted once its transcript files are written unless keep_audio is set.
+        Audio whose transcription or saving failed is always kept, so a retry reuses it instead
+        of downloading the video again.
+        """
+        if segments_format not in self.SEGMENTS_FORMATS:
+            raise ValueError(f"Invalid segments format. Choose from: {', '.join(self.SEGMENTS_FORMATS)}")
         self.output_directory = output_directory
-        if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
-        self.ytt_api = YouTubeTranscriptApi()
+        self.segments_format = segments_format
+        self.keep_audio = keep_audio
+        os.makedirs(output_directory, exist_ok=True)
+        self._ytt_api = None
+        # Direct audio stream URLs and their HTTP headers by video ID, resolved lazily for streaming
+        self._stream_urls: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self._resolver = None
+        if model_name:
+            self._prepare_model(model_name)
+    
+    @property
+    def ytt_api(self) -> Any:
+        """The youtube-transcript-api client, created on first use."""
+        if self._ytt_api is None:
+            self._ytt_api = _require("youtube_transcript_api", "youtube-transcript-api").YouTubeTranscriptApi()
+        return self._ytt_api
     
     def extract_video_id(self, youtube_url: str) -> str:
         """Extract the video ID from a YouTube URL or return the ID if already an ID."""
-        # Check if it's already just an ID (11 characters)
-        if re.match(r'^[A-Za-z0-9_-]{11}$', youtube_url):
-            return youtube_url
-            
-        # Try to extract from URL
-        video_id_match = re.search(r'(?:v=|\/videos\/|embed\/|youtu.be\/|\/v\/|\/e\/|watch\?v=|&v=)([^#\&\?\/]{11})', youtube_url)
+        # Either it's already just an ID (11 characters), or try to extract it from the URL
+        video_id_match = VIDEO_ID_RE.match(youtube_url) or VIDEO_URL_RE.search(youtube_url)
         if video_id_match:
             return video_id_match.group(1)
         else:
@@ -98,55 +248,70 @@ class YouTubeTranscriptTool:
         
         try:
             transcript = self.ytt_api.fetch(video_id, languages=languages, preserve_formatting=preserve_formatting)
-            
-            # Save transcript to file
-            output_path = os.path.join(self.output_directory, f"{video_id}_transcript.txt")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                for snippet in transcript:
-                    f.write(f"[{snippet.start:.2f}s - {(snippet.start + snippet.duration):.2f}s] {snippet.text}\n")
-            
-            print(f"Transcript saved to: {output_path}")
-            
-            return {
-                'video_id': video_id,
-                'language': transcript.language,
-                'language_code': transcript.language_code,
-                'is_generated': transcript.is_generated,
-                'transcript': transcript.to_raw_data(),
-                'file_path': output_path
-            }
+            return self._save_fetched_transcript(video_id, transcript)
             
         except Exception as e:
             print(f"Error fetching transcript: {str(e)}")
             raise
     
-    def download_and_transcribe(self, youtube_url: str, model_name: str = "large") -> Dict[str, Any]:
-        """
-        Download a YouTube video as audio and transcribe it with Whisper.
+    def _save_fetched_transcript(self, video_id: str, transcript: Any) -> Dict[str, Any]:
+        """Save a transcript fetched from YouTube and return it in fetch_transcript's result format."""
+        # Save transcript to file
+        output_path = os.path.join(self.output_directory, f"{video_id}_transcript.txt")
+        lines = [f"[{s.start:.2f}s - {(s.start + s.duration):.2f}s] {s.text}\n" for s in transcript]
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write("".join(lines))
         
-        Args:
-            youtube_url: YouTube URL or video ID
-            model_name: Whisper model name to use
-            
-        Returns:
-            Dictionary with transcription data and file paths
-        """
-        if model_name not in self.WHISPER_MODELS:
-            raise ValueError(f"Invalid model name. Choose from: {', '.join(self.WHISPER_MODELS)}")
+        print(f"Transcript saved to: {output_path}")
         
+        return {
+            'video_id': video_id,
+            'language': transcript.language,
+            'language_code': transcript.language_code,
+            'is_generated': transcript.is_generated,
+            'transcript': transcript.to_raw_data(),
+            'file_path': output_path
+        }
+    
+    def _download_audio(self, youtube_url: str) -> Tuple[str, str]:
+        """Download the audio track of a YouTube video with yt-dlp. Returns (video_id, audio_file)."""
         video_id = self.extract_video_id(youtube_url)
-        audio_file = os.path.join(self.output_directory, f"{video_id}.mp3")
+        audio_file = os.path.join(self.output_directory, f"{video_id}.wav")
+        
+        # Files are named by video ID, so any URL form of an already downloaded video reuses its audio
+        if os.path.exists(audio_file):
+            print(f"Using previously downloaded audio: {audio_file}")
+            return video_id, audio_file
         
         # Download audio using yt-dlp
         print(f"Downloading audio from: {youtube_url}")
         youtube_full_url = f"https://www.youtube.com/watch?v={video_id}" if len(video_id) == 11 else youtube_url
         
+        output_template = os.path.splitext(audio_file)[0] + ".%(ext)s"
+        
+        yt_dlp = _import_optional("yt_dlp")
+        if yt_dlp is not None:
+            options = {
+                "format": "bestaudio/best",
+                "outtmpl": output_template,
+                "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "wav"}],  # Convert to PCM wav
+                "postprocessor_args": {"extractaudio+ffmpeg_o": ["-ac", "1", "-ar", str(SAMPLE_RATE)]},  # Mono at Whisper's sample rate
+                "quiet": True,
+            }
+            try:
+                with yt_dlp.YoutubeDL(options) as ydl:
+                    ydl.download([youtube_full_url])
+            except yt_dlp.DownloadError as e:
+                raise Exception(f"Failed to download video: {e}")
+            print(f"Audio downloaded to: {audio_file}")
+            return video_id, audio_file
+        
         command = [
             "yt-dlp",
             "-x",  # Extract audio
-            "--audio-format", "mp3",  # Convert to mp3
-            "--audio-quality", "0",  # Best quality
-            "-o", audio_file,  # Output filename
+            "--audio-format", "wav",  # Convert to PCM wav
+            "--postprocessor-args", f"ExtractAudio+ffmpeg_o:-ac 1 -ar {SAMPLE_RATE}",  # Mono at Whisper's sample rate
+            "-o", output_template,  # Output filename
             youtube_full_url  # URL to download
         ]
         
@@ -158,6 +323,82 @@ class YouTubeTranscriptTool:
         except FileNotFoundError:
             raise Exception("yt-dlp not found. Please install it with 'pip install yt-dlp'")
         
+        return video_id, audio_file
+    
+    def _resolve_stream_url(self, video_id: str, youtube_full_url: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Resolve a video to the direct URL of its best audio stream and the HTTP headers yt-dlp
+        would send with it. Returns (url, headers).
+        Resolved streams are kept for the session so repeat requests skip yt-dlp's format negotiation.
+        """
+        if video_id not in self._stream_urls:
+            if self._resolver is None:
+                self._resolver = _import_optional("yt_dlp").YoutubeDL({"format": "bestaudio/best", "skip_download": True, "quiet": True})
+            try:
+                info = self._resolver.extract_info(youtube_full_url, download=False)
+            except _import_optional("yt_dlp").DownloadError as e:
+                raise Exception(f"Failed to resolve audio stream: {e}")
+            if "url" not in info:
+                # e.g. formats only available as a list of fragments, which ffmpeg can't fetch from one URL
+                raise Exception(f"No direct audio stream URL for format '{info.get('format_id')}'; "
+                                "download the audio instead of streaming it")
+            self._stream_urls[video_id] = (info["url"], info.get("http_headers") or {})
+        return self._stream_urls[video_id]
+    
+    def _stream_audio(self, youtube_url: str) -> Tuple[str, "np.ndarray"]:
+        """
+        Stream the audio track of a YouTube video through ffmpeg without writing it to disk.
+        Returns (video_id, samples) with samples as 16 kHz mono float32.
+        """
+        video_id = self.extract_video_id(youtube_url)
+        print(f"Streaming audio from: {youtube_url}")
+        youtube_full_url = f"https://www.youtube.com/watch?v={video_id}" if len(video_id) == 11 else youtube_url
+        
+        ffmpeg_output = [
+            "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE),  # Raw float32 samples at Whisper's sample rate
+            "pipe:1"
+        ]
+        
+        np = _require("numpy", "numpy")
+        if _import_optional("yt_dlp") is not None:
+            # ffmpeg reads the resolved audio stream directly, so yt-dlp isn't in the data path at all
+            stream_url, headers = self._resolve_stream_url(video_id, youtube_full_url)
+            ffmpeg_command = ["ffmpeg", "-loglevel", "error"]
+            if headers:
+                # Send the same headers (User-Agent etc.) yt-dlp would, or YouTube may reject or throttle the request
+                ffmpeg_command += ["-headers", "".join(f"{key}: {value}\r\n" for key, value in headers.items())]
+            ffmpeg_command += ["-i", stream_url] + ffmpeg_output
+            try:
+                raw = subprocess.run(ffmpeg_command, stdout=subprocess.PIPE, check=True).stdout
+            except subprocess.CalledProcessError as e:
+                raise Exception(f"Failed to stream audio: {e}")
+            except FileNotFoundError:
+                raise Exception("ffmpeg not found. Please make sure ffmpeg is installed")
+            return video_id, np.frombuffer(raw, dtype=np.float32)
+        
+        ytdlp_command = ["yt-dlp", "-q", "-f", "bestaudio/best", "-o", "-", youtube_full_url]
+        ffmpeg_command = ["ffmpeg", "-loglevel", "error", "-i", "pipe:0"] + ffmpeg_output
+        
+        try:
+            ytdlp = subprocess.Popen(ytdlp_command, stdout=subprocess.PIPE)
+            ffmpeg = subprocess.Popen(ffmpeg_command, stdin=ytdlp.stdout, stdout=subprocess.PIPE)
+        except FileNotFoundError as e:
+            raise Exception(f"{e.filename} not found. Please make sure yt-dlp and ffmpeg are installed")
+        # Let yt-dlp see a broken pipe if ffmpeg exits early
+        ytdlp.stdout.close()
+        raw = ffmpeg.stdout.read()
+        ffmpeg.wait()
+        ytdlp.wait()
+        if ytdlp.returncode or ffmpeg.returncode:
+            raise Exception(f"Failed to stream audio (yt-dlp exit code {ytdlp.returncode}, ffmpeg exit code {ffmpeg.returncode})")
+        
+        return video_id, np.frombuffer(raw, dtype=np.float32)
+    
+    def _prepare_model(self, model_name: str) -> Tuple["WhisperModel", str, str]:
+        """Load (or reuse) a Whisper model. Returns (model, device, compute_type)."""
+        if model_name not in self.WHISPER_MODELS:
+            raise ValueError(f"Invalid model name. Choose from: {', '.join(self.WHISPER_MODELS)}")
+        
         # Check if model is already downloaded
         downloaded_models = self.get_downloaded_models()
         if model_name not in downloaded_models:
@@ -165,26 +406,66 @@ class YouTubeTranscriptTool:
         else:
             print(f"Loading existing Whisper model '{model_name}'...")
             
-        # Load Whisper model
-        model = whisper.load_model(model_name)
-        
-        # Transcribe audio
-        print("Transcribing audio...")
-        result = model.transcribe(audio_file)
-        
+        # Load Whisper model (CTranslate2 backend, quantized to int8 where supported);
+        # models stay cached for the lifetime of the process
+        device, compute_type = _select_device()
+        model = _get_model(model_name, device, compute_type)
+        if model_name not in downloaded_models:
+            self._scan_model_cache.cache_clear()
+        return model, device, compute_type
+    
+    @staticmethod
+    def _transcribe_audio(model: Any, audio: Union[str, "np.ndarray"], language: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Run Whisper on an audio file (or 16 kHz mono samples) and return its text,
+        segments and detected language.
+        """
+        if isinstance(audio, str):
+            # The wav is already 16 kHz mono, so hand Whisper the samples instead of having it decode and resample
+            samples = _read_wav(audio)
+            if samples is not None:
+                audio = samples
+        segments_iter, info = model.transcribe(audio, language=language, beam_size=5,
+                                             vad_filter=True, vad_parameters=VAD_PARAMETERS, **kwargs)
+        segments = [{"start": s.start, "end": s.end, "text": s.text} for s in segments_iter]
+        return {"text": "".join(s["text"] for s in segments), "segments": segments, "language": info.language}
+    
+    def _save_transcription(self, video_id: str, result: Dict[str, Any], audio_file: Optional[str] = None) -> Dict[str, Any]:
+        """Write the full transcript and the timestamped segments to the output directory."""
         # Save full transcript to file
-        transcript_file = os.path.splitext(audio_file)[0] + '_transcript.txt'
+        transcript_file = os.path.join(self.output_directory, f"{video_id}_transcript.txt")
         with open(transcript_file, 'w', encoding='utf-8') as f:
             f.write(result["text"])
         
         # Save timestamped segments to separate file
-        segments_file = os.path.splitext(audio_file)[0] + '_segments.txt'
-        with open(segments_file, 'w', encoding='utf-8') as f:
-            for segment in result["segments"]:
-                start_time = segment["start"]
-                end_time = segment["end"]
-                text = segment["text"]
-                f.write(f"[{start_time:.2f}s - {end_time:.2f}s] {text.strip()}\n")
+        segments_file = os.path.join(self.output_directory, f"{video_id}_segments.{self.segments_format}")
+        if self.segments_format == "jsonl":
+            rows = [{"start": s["start"], "end": s["end"], "text": s["text"].strip()} for s in result["segments"]]
+            orjson = _import_optional("orjson")
+            if orjson is not None:
+                with open(segments_file, 'wb') as f:
+                    f.write(b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows))
+            else:
+                with open(segments_file, 'w', encoding='utf-8') as f:
+                    f.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+        else:
+            if self.segments_format == "srt":
+                lines = [
+                    f"{i}\n{_srt_timestamp(s['start'])} --> {_srt_timestamp(s['end'])}\n{s['text'].strip()}\n\n"
+                    for i, s in enumerate(result["segments"], 1)
+                ]
+            else:
+                lines = [f"[{s['start']:.2f}s - {s['end']:.2f}s] {s['text'].strip()}\n" for s in result["segments"]]
+            with open(segments_file, 'w', encoding='utf-8') as f:
+                f.write("".join(lines))
+        
+        # The audio is only an intermediate; delete it so batch runs don't fill up the disk
+        if audio_file and not self.keep_audio:
+            try:
+                os.remove(audio_file)
+            except FileNotFoundError:
+                pass
+            audio_file = None
         
         print(f"Full transcription saved to: {transcript_file}")
         print(f"Timestamped segments saved to: {segments_file}")
@@ -193,18 +474,268 @@ class YouTubeTranscriptTool:
             'video_id': video_id,
             'transcript': result["text"],
             'segments': result["segments"],
+            'language': result["language"],
             'transcript_file': transcript_file,
             'segments_file': segments_file,
             'audio_file': audio_file
         }
+    
+    def download_and_transcribe(self, youtube_url: str, model_name: str = DEFAULT_MODEL, language: Optional[str] = None,
+                                stream: bool = False) -> Dict[str, Any]:
+        """
+        Download a YouTube video as audio and transcribe it with Whisper.
+        
+        Args:
+            youtube_url: YouTube URL or video ID
+            model_name: Whisper model name to use
+            language: Language code of the audio (detected automatically if None)
+            stream: Pipe the audio straight into Whisper instead of saving it to a file first
+            
+        Returns:
+            Dictionary with transcription data and file paths
+        """
+        model, device, compute_type = self._prepare_model(model_name)
+        if stream:
+            audio_file = None
+            video_id, audio = self._stream_audio(youtube_url)
+        else:
+            video_id, audio_file = self._download_audio(youtube_url)
+            audio = audio_file
+        
+        # Transcribe audio
+        print(f"Transcribing audio on {device} ({compute_type})...")
+        result = self._transcribe_audio(model, audio, language)
+        
+        return self._save_transcription(video_id, result, audio_file)
+    
+    def transcribe_auto(self, youtube_url: str, languages: List[str] = ['en'], model_name: str = DEFAULT_MODEL) -> Dict[str, Any]:
+        """
+        Use YouTube's own transcript when one exists, and only fall back to Whisper otherwise.
+        
+        Args:
+            youtube_url: YouTube URL or video ID
+            languages: List of language codes to try (in order of preference)
+            model_name: Whisper model name to use if no transcript is available
+            
+        Returns:
+            The result of fetch_transcript or download_and_transcribe, with a 'source'
+            key set to 'youtube' or 'whisper' respectively
+            
+        Only a missing transcript (none in the requested languages, or transcripts disabled)
+        falls back to Whisper; other errors such as blocked requests or unavailable videos are raised.
+        """
+        video_id = self.extract_video_id(youtube_url)
+        errors = _require("youtube_transcript_api", "youtube-transcript-api")
+        
+        try:
+            transcript = self.ytt_api.list(video_id).find_transcript(languages)
+        except (errors.NoTranscriptFound, errors.TranscriptsDisabled) as e:
+            print(f"No YouTube transcript available ({type(e).__name__}), transcribing with Whisper...")
+            result = self.download_and_transcribe(youtube_url, model_name=model_name)
+            result['source'] = 'whisper'
+            return result
+        
+        result = self._save_fetched_transcript(video_id, transcript.fetch())
+        result['source'] = 'youtube'
+        return result
+    
+    def batch_download_and_transcribe(self, youtube_urls: List[str], model_name: str = DEFAULT_MODEL, language: Optional[str] = None,
+                                      batch_size: int = 8, max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Download and transcribe several YouTube videos, overlapping downloads with transcription.
+        
+        Up to max_workers downloads run concurrently while finished downloads are transcribed one
+        after another with a single shared model, using batched inference over each file's chunks.
+        
+        Args:
+            youtube_urls: YouTube URLs or video IDs
+            model_name: Whisper model name to use
+            language: Language code of the audio (detected automatically if None)
+            batch_size: Number of audio chunks decoded together by Whisper
+            max_workers: Maximum number of concurrent downloads
+            
+        Returns:
+            List of result dictionaries (as returned by download_and_transcribe), in input order.
+            URLs for the same video share one download and result. Videos that failed to download
+            or transcribe are reported and left out.
+        """
+        model, device, compute_type = self._prepare_model(model_name)
+        pipeline = _require("faster_whisper", FASTER_WHISPER_REQUIREMENT).BatchedInferencePipeline(model=model)
+        
+        videos = self._group_by_video(youtube_urls)
+        jobs = iter((video_id, youtube_urls[indices[0]]) for video_id, indices in videos.items())
+        results = {
+            video_id: result
+            for video_id, result in self._transcribe_jobs(jobs, pipeline, f"{device} ({compute_type})",
+                                                          language, batch_size, max_workers)
+            if result is not None
+        }
+        return self._results_in_order(videos, results)
+    
+    def _group_by_video(self, youtube_urls: List[str]) -> Dict[str, List[int]]:
+        """
+        Map each video ID to the indices of the URLs that point at it, so every video is
+        downloaded and transcribed once however many URL forms it appears in.
+        URLs without a video ID are reported and left out.
+        """
+        videos: Dict[str, List[int]] = {}
+        for index, youtube_url in enumerate(youtube_urls):
+            try:
+                video_id = self.extract_video_id(youtube_url)
+            except ValueError as e:
+                print(f"Error processing {youtube_url}: {str(e)}")
+                continue
+            videos.setdefault(video_id, []).append(index)
+        return videos
+    
+    @staticmethod
+    def _results_in_order(videos: Dict[str, List[int]], results: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Expand per-video results back to one entry per input URL, in input order."""
+        by_index = {index: results[video_id] for video_id, indices in videos.items() if video_id in results for index in indices}
+        return [by_index[i] for i in sorted(by_index)]
+    
+    def _transcribe_jobs(self, jobs: Iterator[Tuple[str, str]], model: Any, device_label: str, language: Optional[str],
+                         batch_size: int, max_workers: int) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Download and transcribe (video_id, url) jobs, overlapping downloads with transcription.
+        
+        At most max_workers downloads are in flight; the next job is only pulled once a finished
+        download has been handed to Whisper, so audio doesn't pile up on disk ahead of the model.
+        Yields (video_id, result), with None as the result for videos that failed.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as downloads, ThreadPoolExecutor(max_workers=1) as writes:
+            pending: Dict[Future, Tuple[str, str]] = {}
+            
+            def submit_next() -> None:
+                job = next(jobs, None)
+                if job is not None:
+                    pending[downloads.submit(self._download_audio, job[1])] = job
+            
+            for _ in range(max_workers):
+                submit_next()
+            
+            saved = []
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    video_id, youtube_url = pending.pop(future)
+                    submit_next()
+                    try:
+                        _, audio_file = future.result()
+                        print(f"Transcribing {video_id} on {device_label}...")
+                        result = self._transcribe_audio(model, audio_file, language, batch_size=batch_size)
+                    except Exception as e:
+                        print(f"Error processing {youtube_url}: {str(e)}")
+                        yield video_id, None
+                        continue
+                    # Write files in the background so the model moves on to the next video
+                    saved.append((video_id, youtube_url, writes.submit(self._save_transcription, video_id, result, audio_file)))
+            
+            for video_id, youtube_url, future in saved:
+                try:
+                    yield video_id, future.result()
+                except OSError as e:
+                    print(f"Error saving transcript for {youtube_url}: {str(e)}")
+                    yield video_id, None
+    
+    def batch_transcribe(self, youtube_urls: List[str], model_name: str = DEFAULT_MODEL, language: Optional[str] = None,
+                         num_gpus: Optional[int] = None, batch_size: int = 8, max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Download and transcribe several YouTube videos, sharding them across all available GPUs.
+        
+        One worker process is started per GPU, each with its own copy of the model. The workers
+        pull videos from a shared queue and run the same pipelined loop as
+        batch_download_and_transcribe, so every GPU keeps transcribing while its next downloads
+        run. With a single GPU (or none) this is the same as batch_download_and_transcribe.
+        
+        Args:
+            youtube_urls: YouTube URLs or video IDs
+            model_name: Whisper model name to use
+            language: Language code of the audio (detected automatically if None)
+            num_gpus: Number of GPUs to use (all available GPUs if None)
+            batch_size: Number of audio chunks decoded together by Whisper
+            max_workers: Maximum number of concurrent downloads (at most 2 per GPU when sharding,
+                so the queue stays balanced between GPUs)
+            
+        Returns:
+            List of result dictionaries (as returned by download_and_transcribe), in input order.
+            URLs for the same video share one download and result. Videos that failed to download
+            or transcribe are reported and left out.
+        """
+        if model_name not in self.WHISPER_MODELS:
+            raise ValueError(f"Invalid model name. Choose from: {', '.join(self.WHISPER_MODELS)}")
+        
+        available_gpus = _require("ctranslate2", FASTER_WHISPER_REQUIREMENT).get_cuda_device_count()
+        num_gpus = min(num_gpus or available_gpus, available_gpus)
+        if num_gpus <= 1:
+            return self.batch_download_and_transcribe(youtube_urls, model_name=model_name, language=language,
+                                                      batch_size=batch_size, max_workers=max_workers)
+        
+        # CUDA cannot be initialized in forked children, so workers are spawned
+        context = multiprocessing.get_context("spawn")
+        jobs = context.Queue()
+        finished = context.Queue()
+        videos = self._group_by_video(youtube_urls)
+        for video_id, indices in videos.items():
+            jobs.put((video_id, youtube_urls[indices[0]]))
+        for _ in range(num_gpus):
+            jobs.put(None)
+        
+        print(f"Transcribing {len(videos)} videos on {num_gpus} GPUs...")
+        workers = [
+            context.Process(target=_gpu_worker, args=(device_index, model_name, self.output_directory, self.segments_format,
+                                                          self.keep_audio, language, batch_size, max_workers, jobs, finished))
+            for device_index in range(num_gpus)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        remaining = len(videos)
+        while remaining:
+            try:
+                video_id, result = finished.get(timeout=5)
+            except queue.Empty:
+                # Don't wait forever on videos whose worker died
+                if not any(worker.is_alive() for worker in workers):
+                    break
+                continue
+            remaining -= 1
+            if result is not None:
+                results[video_id] = result
+        
+        for worker in workers:
+            worker.join()
+        
+        return self._results_in_order(videos, results)
 
-def main():
+def _gpu_worker(device_index: int, model_name: str, output_directory: str, segments_format: str, keep_audio: bool,
+                language: Optional[str], batch_size: int, max_workers: int,
+                jobs: "multiprocessing.Queue", finished: "multiprocessing.Queue") -> None:
+    """
+    Transcribe (video_id, url) jobs on one GPU until a None sentinel arrives, overlapping downloads
+    with batched transcription. Reports (video_id, result or None) for every job.
+    """
+    tool = YouTubeTranscriptTool(output_directory, segments_format=segments_format, keep_audio=keep_audio)
+    # GPUs in one machine can differ, so check what this one supports rather than device 0
+    _, compute_type = _select_device(device_index)
+    model = _get_model(model_name, "cuda", compute_type, device_index)
+    pipeline = _require("faster_whisper", FASTER_WHISPER_REQUIREMENT).BatchedInferencePipeline(model=model)
+    
+    # Every job pulled off the shared queue is one the other GPUs can't take, so only keep
+    # a couple of downloads ahead; that is enough to hide download time behind transcription
+    for video_id, result in tool._transcribe_jobs(iter(jobs.get, None), pipeline, f"GPU {device_index}",
+                                                  language, batch_size, min(max_workers, 2)):
+        finished.put((video_id, result))
+
+def interactive_main():
     print("===== YouTube Transcript Tool =====")
     print("This tool can either:")
     print("1. Fetch a transcript using youtube-transcript-api")
     print("2. Download a video and transcribe it locally with Whisper")
+    print("3. Use YouTube's transcript if there is one, otherwise transcribe with Whisper")
     
-    choice = input("\nEnter your choice (1 or 2): ").strip()
+    choice = input("\nEnter your choice (1, 2 or 3, default is 3): ").strip() or "3"
     
     youtube_url = input("\nEnter YouTube URL or video ID: ").strip()
     
@@ -265,7 +796,8 @@ def main():
             if downloaded_models:
                 print("\n(✓) = Already downloaded")
             
-            model_choice = input("\nEnter model number (default is 'large'): ").strip()
+            default_model = tool.DEFAULT_MODEL
+            model_choice = input(f"\nEnter model number (default is '{default_model}'): ").strip()
             
             if model_choice:
                 try:
@@ -273,13 +805,13 @@ def main():
                     if 0 <= model_index < len(tool.WHISPER_MODELS):
                         selected_model = tool.WHISPER_MODELS[model_index]
                     else:
-                        print("Invalid selection, using 'large' model.")
-                        selected_model = "large"
+                        print(f"Invalid selection, using '{default_model}' model.")
+                        selected_model = default_model
                 except ValueError:
-                    print("Invalid input, using 'large' model.")
-                    selected_model = "large"
+                    print(f"Invalid input, using '{default_model}' model.")
+                    selected_model = default_model
             else:
-                selected_model = "large"
+                selected_model = default_model
             
             # Let user know if they're downloading a new model
             if selected_model not in downloaded_models:
@@ -304,8 +836,98 @@ def main():
                 
         except Exception as e:
             print(f"Error: {str(e)}")
+            
+    elif choice == "3":
+        # Only fall back to Whisper when YouTube has no transcript
+        try:
+            result = tool.transcribe_auto(youtube_url)
+            
+            if result['source'] == 'youtube':
+                print(f"\nUsed YouTube transcript ({result['language']}).")
+                print(f"Full transcript saved to: {result['file_path']}")
+            else:
+                print("\nTranscription complete!")
+                print(f"Full transcript saved to: {result['transcript_file']}")
+                print(f"Timestamped segments saved to: {result['segments_file']}")
+                
+        except Exception as e:
+            print(f"Error: {str(e)}")
     else:
-        print("Invalid choice. Please run the script again and select either 1 or 2.")
+        print("Invalid choice. Please run the script again and select 1, 2 or 3.")
+
+def _process_url(youtube_url: str, mode: str, model_name: str, languages: List[str], output_directory: str,
+                 segments_format: str, keep_audio: bool) -> bool:
+    """Handle a single URL from the command line. Returns True if its transcript was saved."""
+    tool = YouTubeTranscriptTool(output_directory, segments_format=segments_format, keep_audio=keep_audio)
+    try:
+        if mode == "api":
+            tool.fetch_transcript(youtube_url, languages=languages)
+        elif mode == "whisper":
+            tool.download_and_transcribe(youtube_url, model_name=model_name)
+        else:
+            tool.transcribe_auto(youtube_url, languages=languages, model_name=model_name)
+    except Exception as e:
+        print(f"Error processing {youtube_url}: {str(e)}")
+        return False
+    return True
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Fetch YouTube transcripts or transcribe videos locally with Whisper. "
+                    "Run without arguments for the interactive menu.")
+    parser.add_argument("urls", nargs="*", help="YouTube URLs or video IDs (read one per line from stdin if omitted)")
+    parser.add_argument("--mode", choices=["api", "whisper", "auto"], default="auto",
+                        help="api: YouTube transcript only, whisper: always transcribe locally, "
+                             "auto: YouTube transcript if available, else Whisper (default: auto)")
+    parser.add_argument("--model", default=YouTubeTranscriptTool.DEFAULT_MODEL, choices=YouTubeTranscriptTool.WHISPER_MODELS,
+                        help=f"Whisper model to use (default: {YouTubeTranscriptTool.DEFAULT_MODEL})")
+    parser.add_argument("--languages", type=lambda value: value.split(","), default=["en"],
+                        help="Comma-separated transcript language codes to try, in order of preference (default: en)")
+    parser.add_argument("--output-dir", default="transcripts", help="Directory to save files to (default: transcripts)")
+    parser.add_argument("--format", dest="segments_format", choices=YouTubeTranscriptTool.SEGMENTS_FORMATS, default="txt",
+                        help="Format of the Whisper segments file (default: txt)")
+    parser.add_argument("--keep-audio", action="store_true", help="Keep the downloaded audio files after transcription")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of videos to process in parallel processes in api and auto mode; "
+                             "whisper mode always batches over the available GPUs (default: 1)")
+    args = parser.parse_args(argv)
+    
+    urls = args.urls
+    if not urls:
+        if sys.stdin.isatty():
+            interactive_main()
+            return 0
+        urls = [line.strip() for line in sys.stdin if line.strip()]
+        if not urls:
+            parser.error("no URLs given")
+    
+    if args.mode == "whisper" and len(urls) > 1:
+        # One model for all videos, with downloads overlapped and spread over any extra GPUs
+        tool = YouTubeTranscriptTool(args.output_dir, segments_format=args.segments_format, keep_audio=args.keep_audio)
+        results = tool.batch_transcribe(urls, model_name=args.model)
+        succeeded = [True] * len(results) + [False] * (len(urls) - len(results))
+    elif args.jobs > 1:
+        # Processes working on the same video would download to and delete the same wav, so each
+        # video is handled once and its outcome shared by every URL that points at it
+        tool = YouTubeTranscriptTool(args.output_dir, segments_format=args.segments_format, keep_audio=args.keep_audio)
+        videos = tool._group_by_video(urls)
+        process_url = functools.partial(_process_url, mode=args.mode, model_name=args.model,
+                                        languages=args.languages, output_directory=args.output_dir,
+                                        segments_format=args.segments_format, keep_audio=args.keep_audio)
+        succeeded = [False] * len(urls)
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            outcomes = executor.map(process_url, [urls[indices[0]] for indices in videos.values()])
+            for indices, ok in zip(videos.values(), outcomes):
+                for index in indices:
+                    succeeded[index] = ok
+    else:
+        succeeded = [_process_url(url, args.mode, args.model, args.languages, args.output_dir,
+                                  args.segments_format, args.keep_audio)
+                     for url in urls]
+    
+    failed = succeeded.count(False)
+    if failed:
+        print(f"{failed} of {len(urls)} videos failed.")
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file